@@ -36,7 +36,8 @@ if uploaded_data is not None:
         "Temperature Analysis",
         "Histograms",
         "Box Plots",
-        "Scatter Plot"
+        "Scatter Plot",
+        "Climatology"
     ])
     
     if selected_analysis == "Summary Statistics":
@@ -96,5 +97,18 @@ if uploaded_data is not None:
         if x_col and y_col:
             scatter_plot(x_col, y_col,data)
 
+    elif selected_analysis == "Climatology":
+        st.subheader("Climatology")
+        bin_minutes = st.selectbox("Time-of-day Bin (minutes)", [60, 30, 15, 10])
+        cube = load_climatology(uploaded_data.file_id, bin_minutes, data_analysis)
+        column = st.selectbox("Select column", cube.columns)
+        stat = st.selectbox("Statistic", cube.STATS)
+        q = st.slider("Percentile", 0, 100, 50) if stat == "percentile" else None
+        climatology_heatmap(cube, column, stat, q)
+        months = st.multiselect("Months for Diurnal Profile", list(range(1, 13)), default=list(range(1, 13)))
+        profile_columns = st.multiselect("Diurnal Profile Columns", cube.columns, default=[column])
+        if months and profile_columns:
+            diurnal_profile(cube, profile_columns, months)
+
 else:
     st.write("No data uploaded yet. Please upload a CSV file.")
@@ -139,4 +139,38 @@ def scatter_plot(x_col, y_col, data):
     plt.xlabel(x_col)
     plt.ylabel(y_col)
     plt.grid(True)
-    st.pyplot()
\ No newline at end of file
+    st.pyplot()
+
+
+@st.cache_resource(max_entries=8)
+def load_climatology(file_id, bin_minutes, _data_analysis):
+    # Built once per uploaded file and bin size; Streamlit does not hash the underscored argument
+    return _data_analysis.climatology(bin_minutes=bin_minutes)
+
+
+def climatology_heatmap(cube, column, stat='mean', q=None):
+    table = cube.table(column, stat=stat, q=q)
+    label = f'P{q:g}' if stat == 'percentile' else stat.capitalize()
+
+    fig, ax = plt.subplots(figsize=(14, 6))
+    sns.heatmap(table, cmap='viridis', cbar_kws={'label': f'{label} {column}'}, ax=ax)
+    ax.set_xlabel('Time of Day')
+    ax.set_ylabel('Month')
+    ax.set_title(f'{label} {column} by Month and Time of Day')
+    st.pyplot(fig)
+
+
+def diurnal_profile(cube, columns, months=None, percentiles=(25, 75)):
+    fig, ax = plt.subplots(figsize=(12, 6))
+    for col in columns:
+        mean = cube.profile(col, months=months)
+        ax.plot(mean.index, mean.values, label=col)
+        lower = cube.profile(col, stat='percentile', q=percentiles[0], months=months)
+        upper = cube.profile(col, stat='percentile', q=percentiles[1], months=months)
+        ax.fill_between(mean.index, lower.values, upper.values, alpha=0.2)
+    ax.set_xticks(range(0, cube.slots, max(1, cube.slots // 12)))
+    ax.set_xlabel('Time of Day')
+    ax.set_ylabel('Value')
+    ax.set_title('Diurnal Profile')
+    ax.legend()
+    st.pyplot(fig)
@@ -1,7 +1,10 @@
+import os
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+from scripts.climatology import ClimatologyCube
+
 class DataAnalysis:
     """
     A reusable class for data analysis tasks.
@@ -9,6 +12,7 @@ class DataAnalysis:
     Attributes:
         file_path (str): Path to the data file.
         df (pd.DataFrame, None): Loaded DataFrame, initialized to None.
+        climatology_cube (ClimatologyCube, None): Climatology of the loaded data, built on first use.
     """
 
     def __init__(self, file_path):
@@ -20,17 +24,26 @@ class DataAnalysis:
         """
         self.file_path = file_path
         self.df = None
+        self.climatology_cube = None
+        self._loaded_df = None  # Frame read by load_data(), to tell it apart from one set directly
+        self._climatology_df = None  # Frame the cached climatology_cube was built from
 
 
-    def load_data(self):
+    def load_data(self, columns=None):
         """
         Loads the data from the provided file path into a pandas DataFrame.
 
+        Args:
+            columns (list, optional): Only read these columns (default: None, read all columns).
+
         Returns:
             pd.DataFrame: The loaded DataFrame on success, None otherwise.
         """
         try:
-            self.df = pd.read_csv(self.file_path)
+            self.df = pd.read_csv(self.file_path, usecols=columns)
+            # Only a full read may stand in for the file, e.g. for the climatology disk cache
+            self._loaded_df = self.df if columns is None else None
+            self.climatology_cube = None
             print("Dataset loaded successfully!")
             return self.df  # Return the DataFrame for chaining
         except FileNotFoundError:
@@ -444,4 +457,120 @@ class DataAnalysis:
 
         df_cleaned = df_cleaned.reset_index(drop=True)
 
-        return df_cleaned
\ No newline at end of file
+        return df_cleaned
+
+
+    def climatology(self, bin_minutes=60, rebuild=False, data=None):
+        """
+        Returns the month × time-of-day climatology of all numeric columns.
+
+        For the loaded data (self.df) the cube is kept on the object until self.df changes.
+        When self.df was read by load_data(), the cube is also persisted next to the data file
+        as '<name>.climatology.<bin_minutes>min.npz', so later sessions load it instead of
+        recomputing; it is rebuilt when the data file is newer. If the file cannot be written,
+        a warning is printed and the in-memory cube is returned.
+
+        Args:
+            bin_minutes (int, optional): Width of the time-of-day bins in minutes (default: 60).
+            rebuild (bool, optional): Ignore any cached cube and rebuild it (default: False).
+            data (pandas.DataFrame, optional): The DataFrame to summarize.
+                Defaults to None, in which case self.df is used and the cube is cached.
+
+        Returns:
+            ClimatologyCube: The climatology cube.
+
+        Raises:
+            ValueError: If the data is not loaded and no data argument is provided.
+        """
+        if data is not None:
+            return ClimatologyCube.from_frame(data, bin_minutes=bin_minutes)
+
+        self.check_data_loaded()
+        cube = self.climatology_cube
+        if (not rebuild and cube is not None and cube.bin_minutes == bin_minutes
+                and self._climatology_df is self.df):
+            return cube
+
+        # Only use the disk cache for data that came straight from the file
+        cube_path = None
+        if isinstance(self.file_path, str) and self.df is self._loaded_df:
+            cube_path = f'{os.path.splitext(self.file_path)[0]}.climatology.{bin_minutes}min.npz'
+            if (not rebuild and os.path.exists(cube_path)
+                    and os.path.getmtime(cube_path) >= os.path.getmtime(self.file_path)):
+                cube = ClimatologyCube.load(cube_path)
+                self.climatology_cube, self._climatology_df = cube, self.df
+                return cube
+
+        cube = ClimatologyCube.from_frame(self.df, bin_minutes=bin_minutes)
+        if cube_path is not None:
+            try:
+                cube.save(cube_path)
+            except OSError as error:
+                # The cache is an optimisation; a read-only data directory must not break plotting
+                print(f"Warning: Could not save climatology to '{cube_path}': {error}")
+        self.climatology_cube, self._climatology_df = cube, self.df
+        return cube
+
+
+
+    def climatology_heatmap(self, column, stat='mean', q=None, bin_minutes=60, data=None):
+        """
+        Plots a month × time-of-day heatmap of a statistic for one column, rendered from the climatology cube.
+
+        Args:
+            column (str): Name of the column to plot.
+            stat (str, optional): 'mean', 'std', 'count', 'min', 'max' or 'percentile' (default: 'mean').
+            q (float, optional): Percentile (0-100), required for stat='percentile'.
+            bin_minutes (int, optional): Width of the time-of-day bins in minutes (default: 60).
+            data (pandas.DataFrame, optional): The DataFrame to plot.
+                Defaults to None, in which case self.df is used.
+
+        Raises:
+            ValueError: If the data is not loaded, or the column or statistic is unknown.
+        """
+        table = self.climatology(bin_minutes=bin_minutes, data=data).table(column, stat=stat, q=q)
+        label = f'P{q:g}' if stat == 'percentile' else stat.capitalize()
+
+        plt.figure(figsize=(14, 6))
+        sns.heatmap(table, cmap='viridis', cbar_kws={'label': f'{label} {column}'})
+        plt.xlabel('Time of Day')
+        plt.ylabel('Month')
+        plt.title(f'{label} {column} by Month and Time of Day')
+        plt.show()
+
+
+    def diurnal_profile(self, columns, months=None, percentiles=(25, 75), bin_minutes=60, data=None):
+        """
+        Plots the typical-day mean profile of the specified columns with a percentile band,
+        rendered from the climatology cube.
+
+        Args:
+            columns (list): A list of column names to plot.
+            months (list, optional): Months (1-12) to pool (default: all months).
+            percentiles (tuple, optional): Lower and upper percentile of the shaded band (default: (25, 75)).
+            bin_minutes (int, optional): Width of the time-of-day bins in minutes (default: 60).
+            data (pandas.DataFrame, optional): The DataFrame to plot.
+                Defaults to None, in which case self.df is used.
+
+        Raises:
+            ValueError: If the data is not loaded, or no columns are found in the climatology.
+        """
+        cube = self.climatology(bin_minutes=bin_minutes, data=data)
+        available_cols = [col for col in columns if col in cube.columns]
+        if not available_cols:
+            raise ValueError("No columns found in the climatology for the diurnal profile.")
+
+        plt.figure(figsize=(12, 6))
+        for col in available_cols:
+            mean = cube.profile(col, months=months)
+            plt.plot(mean.index, mean.values, label=col)
+            if percentiles:
+                lower = cube.profile(col, stat='percentile', q=percentiles[0], months=months)
+                upper = cube.profile(col, stat='percentile', q=percentiles[1], months=months)
+                plt.fill_between(mean.index, lower.values, upper.values, alpha=0.2)
+        plt.xticks(range(0, cube.slots, max(1, cube.slots // 12)))
+        plt.xlabel('Time of Day')
+        plt.ylabel('Value')
+        plt.title('Diurnal Profile')
+        plt.legend()
+        plt.show()
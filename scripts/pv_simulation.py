@@ -0,0 +1,278 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+
+def solar_position(timestamps, latitude, longitude, utc_offset=0):
+    """
+    Calculates the solar zenith and azimuth angles using the NOAA approximation.
+
+    Args:
+        timestamps (pandas.Series): Local timestamps of the observations.
+        latitude (float): Station latitude in degrees (north positive).
+        longitude (float): Station longitude in degrees (east positive).
+        utc_offset (float, optional): Offset of the timestamps from UTC in hours (default: 0).
+
+    Returns:
+        tuple: Solar zenith and azimuth (clockwise from north) in radians, as NumPy arrays.
+    """
+    timestamps = pd.DatetimeIndex(pd.to_datetime(timestamps))
+    hours = timestamps.hour + timestamps.minute / 60 + timestamps.second / 3600
+    days_in_year = np.where(timestamps.is_leap_year, 366, 365)
+    gamma = 2 * np.pi / days_in_year * (timestamps.dayofyear - 1 + (hours - 12) / 24)
+
+    # Equation of time (minutes) and solar declination (radians)
+    eqtime = 229.18 * (0.000075 + 0.001868 * np.cos(gamma) - 0.032077 * np.sin(gamma)
+                       - 0.014615 * np.cos(2 * gamma) - 0.040849 * np.sin(2 * gamma))
+    decl = (0.006918 - 0.399912 * np.cos(gamma) + 0.070257 * np.sin(gamma)
+            - 0.006758 * np.cos(2 * gamma) + 0.000907 * np.sin(2 * gamma)
+            - 0.002697 * np.cos(3 * gamma) + 0.00148 * np.sin(3 * gamma))
+
+    true_solar_time = hours * 60 + eqtime + 4 * longitude - 60 * utc_offset
+    hour_angle = np.radians(true_solar_time / 4 - 180)
+    lat = np.radians(latitude)
+
+    cos_zenith = np.sin(lat) * np.sin(decl) + np.cos(lat) * np.cos(decl) * np.cos(hour_angle)
+    zenith = np.arccos(np.clip(cos_zenith, -1, 1))
+    azimuth = np.arctan2(np.sin(hour_angle),
+                         np.cos(hour_angle) * np.sin(lat) - np.tan(decl) * np.cos(lat)) + np.pi
+
+    return np.asarray(zenith), np.asarray(azimuth)
+
+
+# Time-dependent inputs of the current worker process, set once by _init_worker
+_worker_inputs = None
+
+
+def _init_worker(inputs):
+    """
+    Stores the simulation inputs in a worker process so chunks only ship configurations.
+    """
+    global _worker_inputs
+    _worker_inputs = inputs
+
+
+def _simulate_worker_chunk(tilt, azimuth, params):
+    """
+    Runs _simulate_chunk in a worker process against the inputs set by _init_worker.
+    """
+    return _simulate_chunk(_worker_inputs, tilt, azimuth, params)
+
+
+def _simulate_chunk(inputs, tilt, azimuth, params):
+    """
+    Simulates one chunk of panel orientations against all daylight time steps.
+
+    Time-dependent inputs are column vectors of shape (T, 1) and orientations are
+    row vectors of shape (1, C), so every intermediate array is broadcast to (T, C)
+    and reduced over time before returning. Output is per kWp of installed DC
+    capacity, since the model is linear in system size.
+
+    Returns:
+        dict: Per-orientation plane-of-array irradiation (kWh/m²) and DC and AC energy (kWh/kWp).
+    """
+    # Cosine of the angle of incidence as a single (T, 3) @ (3, C) product
+    panel_normal = np.stack([np.cos(tilt), np.sin(tilt) * np.cos(azimuth), np.sin(tilt) * np.sin(azimuth)])
+    poa = inputs['sun'] @ panel_normal
+
+    # Isotropic sky transposition: beam on the plane plus sky-diffuse and ground-reflected terms,
+    # the latter two as a (T, 2) @ (2, C) product of [DHI + albedo * GHI, DHI - albedo * GHI] / 2 and [1, cos(tilt)]
+    np.clip(poa, 0, None, out=poa)
+    poa *= inputs['DNI']
+    sky = np.hstack([inputs['DHI'] + params['albedo'] * inputs['GHI'],
+                     inputs['DHI'] - params['albedo'] * inputs['GHI']]) / 2
+    poa += sky @ np.stack([np.ones_like(tilt), np.cos(tilt)])
+
+    # Temperature-corrected efficiency 1 + temp_coeff * (T_cell - 25), with the cell temperature
+    # rising linearly with plane-of-array irradiance (Faiman; zero heating for measured TModA)
+    base_efficiency = 1 + params['temp_coeff'] * (inputs['cell_temp_base'] - 25)
+    efficiency_slope = params['temp_coeff'] * inputs['heating']
+    dc_power = efficiency_slope * poa
+    dc_power += base_efficiency
+    dc_power *= poa
+    dc_power *= (1 - params['losses']) / 1000
+    np.clip(dc_power, 0, None, out=dc_power)
+    ac_power = np.minimum(dc_power * params['inverter_eff'], 1 / params['dc_ac_ratio'])
+
+    dt = inputs['dt_hours']
+    return {
+        'poa_kwh_m2': poa.sum(axis=0) * dt / 1000,
+        'dc_kwh': dc_power.sum(axis=0) * dt,
+        'ac_kwh': ac_power.sum(axis=0) * dt,
+    }
+
+
+class PVSimulation:
+    """
+    Simulates PV plant output from station measurements for many plant configurations at once.
+
+    Attributes:
+        data_analysis (DataAnalysis): The station data the simulation runs on.
+        latitude (float): Station latitude in degrees.
+        longitude (float): Station longitude in degrees.
+        utc_offset (float): Offset of the station timestamps from UTC in hours.
+        params (dict): Model parameters (albedo, temperature coefficient, losses, inverter, Faiman coefficients).
+    """
+
+    DEFAULT_PARAMS = {
+        'albedo': 0.2,
+        'temp_coeff': -0.004,   # Relative power change per °C above 25 °C
+        'losses': 0.14,         # Soiling, wiring, mismatch, etc.
+        'inverter_eff': 0.96,
+        'dc_ac_ratio': 1.2,
+        'u0': 25.0,             # Faiman heat-loss coefficients (W/(m²·K), W·s/(m³·K))
+        'u1': 6.84,
+    }
+
+    def __init__(self, data_analysis, latitude, longitude, utc_offset=0, **params):
+        """
+        Initializes the PVSimulation object.
+
+        Args:
+            data_analysis (DataAnalysis): DataAnalysis object with the station data.
+            latitude (float): Station latitude in degrees (north positive).
+            longitude (float): Station longitude in degrees (east positive).
+            utc_offset (float, optional): Offset of the timestamps from UTC in hours (default: 0).
+            **params: Overrides for DEFAULT_PARAMS.
+
+        Raises:
+            ValueError: If an unknown model parameter is given.
+        """
+        unknown = set(params) - set(self.DEFAULT_PARAMS)
+        if unknown:
+            raise ValueError(f"Unknown model parameters: {sorted(unknown)}")
+
+        self.data_analysis = data_analysis
+        self.latitude = latitude
+        self.longitude = longitude
+        self.utc_offset = utc_offset
+        self.params = {**self.DEFAULT_PARAMS, **params}
+
+
+    def prepare_inputs(self, use_module_temp=False, data=None):
+        """
+        Extracts the time-dependent model inputs as NumPy column vectors.
+
+        Time steps without any irradiance are dropped, since they cannot produce energy.
+
+        Args:
+            use_module_temp (bool, optional): Use measured TModA as cell temperature instead of
+                modelling it from Tamb and WS (default: False).
+            data (pandas.DataFrame, optional): The DataFrame to simulate on.
+                Defaults to None, in which case data_analysis.df is used.
+
+        Returns:
+            dict: Sun direction (T, 3), irradiance and temperature columns (T, 1), the time step
+                and the total simulated period in hours.
+
+        Raises:
+            ValueError: If the data is not loaded, required columns are missing or no row is complete.
+        """
+        if data is None:
+            self.data_analysis.check_data_loaded()
+            data = self.data_analysis.df
+
+        required = ['Timestamp', 'GHI', 'DNI', 'DHI'] + (['TModA'] if use_module_temp else ['Tamb', 'WS'])
+        missing_cols = [col for col in required if col not in data.columns]
+        if missing_cols:
+            raise ValueError(f"Columns {missing_cols} not found in the data for PV simulation.")
+
+        data = data.dropna(subset=required)
+        if data.empty:
+            raise ValueError("No rows with complete data found for PV simulation.")
+        timestamps = pd.to_datetime(data['Timestamp'])
+        step = timestamps.diff().median()
+        dt_hours = step / pd.Timedelta(hours=1) if pd.notnull(step) else 1.0
+        total_hours = len(data) * dt_hours
+
+        # Negative night-time readings are sensor offsets, not irradiance
+        irradiance = np.clip(data[['GHI', 'DNI', 'DHI']].to_numpy(dtype=float), 0, None)
+        daylight = irradiance.any(axis=1)
+        irradiance = irradiance[daylight]
+        data = data[daylight]
+
+        zenith, sun_azimuth = solar_position(timestamps[daylight], self.latitude, self.longitude, self.utc_offset)
+        above_horizon = zenith < np.pi / 2
+
+        if use_module_temp:
+            cell_temp_base = data['TModA'].to_numpy(dtype=float)
+            heating = np.zeros(len(data))
+        else:
+            cell_temp_base = data['Tamb'].to_numpy(dtype=float)
+            heating = 1 / (self.params['u0'] + self.params['u1'] * data['WS'].to_numpy(dtype=float))
+
+        return {
+            'sun': np.column_stack([np.cos(zenith),
+                                    np.sin(zenith) * np.cos(sun_azimuth),
+                                    np.sin(zenith) * np.sin(sun_azimuth)]),
+            'GHI': irradiance[:, [0]],
+            'DNI': irradiance[:, [1]] * above_horizon[:, None],
+            'DHI': irradiance[:, [2]],
+            'cell_temp_base': cell_temp_base[:, None],
+            'heating': heating[:, None],
+            'dt_hours': dt_hours,
+            'total_hours': total_hours,
+        }
+
+
+    def simulate(self, tilts, azimuths, system_sizes, use_module_temp=False, chunk_size=None, n_jobs=None, data=None):
+        """
+        Simulates energy for every combination of tilt, azimuth and system size.
+
+        Orientations are evaluated in chunks of (T, chunk_size) broadcast arrays so memory
+        stays bounded; with n_jobs the chunks are spread over a process pool. System sizes
+        scale the per-kWp results, so they add no simulation cost.
+
+        Args:
+            tilts (array-like): Panel tilt angles in degrees from horizontal.
+            azimuths (array-like): Panel azimuth angles in degrees clockwise from north (180 = south).
+            system_sizes (array-like): DC system sizes in kWp.
+            use_module_temp (bool, optional): Use measured TModA as cell temperature (default: False).
+            chunk_size (int, optional): Orientations per chunk (default: sized to ~512K array elements).
+            n_jobs (int, optional): Number of worker processes; None or 1 runs in-process (default: None).
+            data (pandas.DataFrame, optional): The DataFrame to simulate on.
+                Defaults to None, in which case data_analysis.df is used.
+
+        Returns:
+            pandas.DataFrame: One row per configuration with tilt, azimuth, system_size_kw,
+                poa_kwh_m2, dc_kwh, ac_kwh, specific_yield (kWh/kWp) and capacity_factor.
+        """
+        inputs = self.prepare_inputs(use_module_temp=use_module_temp, data=data)
+
+        tilt_grid, azimuth_grid = np.meshgrid(
+            np.radians(np.atleast_1d(np.asarray(tilts, dtype=float))),
+            np.radians(np.atleast_1d(np.asarray(azimuths, dtype=float))),
+            indexing='ij',
+        )
+        tilt_rad, azimuth_rad = tilt_grid.ravel(), azimuth_grid.ravel()
+
+        if chunk_size is None:
+            chunk_size = max(1, 2 ** 19 // max(len(inputs['GHI']), 1))
+        starts = range(0, len(tilt_rad), chunk_size)
+        tilt_chunks = [tilt_rad[start:start + chunk_size] for start in starts]
+        azimuth_chunks = [azimuth_rad[start:start + chunk_size] for start in starts]
+
+        if n_jobs and n_jobs > 1 and len(tilt_chunks) > 1:
+            with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker, initargs=(inputs,)) as executor:
+                results = list(executor.map(_simulate_worker_chunk, tilt_chunks, azimuth_chunks,
+                                            [self.params] * len(tilt_chunks)))
+        else:
+            results = [_simulate_chunk(inputs, tilt, azimuth, self.params)
+                       for tilt, azimuth in zip(tilt_chunks, azimuth_chunks)]
+
+        per_kwp = pd.DataFrame({
+            'tilt': np.degrees(tilt_rad),
+            'azimuth': np.degrees(azimuth_rad),
+            **{key: np.concatenate([result[key] for result in results])
+               for key in ['poa_kwh_m2', 'dc_kwh', 'ac_kwh']},
+        })
+
+        sizes = pd.DataFrame({'system_size_kw': np.atleast_1d(np.asarray(system_sizes, dtype=float))})
+        configs = per_kwp.merge(sizes, how='cross')
+        configs['specific_yield'] = configs['ac_kwh']
+        configs['dc_kwh'] *= configs['system_size_kw']
+        configs['ac_kwh'] *= configs['system_size_kw']
+        configs['capacity_factor'] = configs['specific_yield'] / inputs['total_hours']
+        return configs[['tilt', 'azimuth', 'system_size_kw', 'poa_kwh_m2', 'dc_kwh', 'ac_kwh',
+                        'specific_yield', 'capacity_factor']]
@@ -0,0 +1,232 @@
+import numpy as np
+import pandas as pd
+
+from scripts.data_analysis_utils import DataAnalysis
+
+
+class StationComparison:
+    """
+    Compares several measurement stations on a shared time grid.
+
+    Stations are read in two passes, one station at a time. The first pass records
+    which grid slots each station covers as a boolean mask (one byte per slot); the
+    shared grid is the set of slots inside the common time window that every station
+    covers. The second pass reduces each station directly to its metrics over that
+    shared grid. Stations given as file paths or as unloaded DataAnalysis objects are
+    read into temporary frames holding only the Timestamp and compared columns, which
+    are released after each pass, so peak memory is one such frame plus one mask per
+    station. DataAnalysis objects the caller already loaded are used as is. No wide
+    joined frame is built.
+
+    Attributes:
+        stations (dict): Mapping of station name to a file path or DataAnalysis object.
+        freq (str): Grid resolution as a pandas frequency string (e.g. 'min', 'h').
+        columns (list): Irradiance columns to compare.
+        occupancy (dict): Per-station (first slot, covered-slot mask) pairs, filled by align().
+        window (tuple, None): First and last slot of the common time window, filled by align().
+        shared (numpy.ndarray, None): Mask of window slots covered by every station, filled by align().
+    """
+
+    def __init__(self, stations=None, freq='h', columns=None):
+        """
+        Initializes the StationComparison object.
+
+        Args:
+            stations (dict, optional): Mapping of station name to a file path or DataAnalysis object.
+            freq (str, optional): Grid resolution as a pandas frequency string (default: 'h').
+            columns (list, optional): Irradiance columns to compare (default: ['GHI', 'DNI', 'DHI']).
+        """
+        self.stations = dict(stations) if stations else {}
+        self.freq = freq
+        self.step = pd.Timedelta(pd.tseries.frequencies.to_offset(freq))
+        self.columns = columns if columns is not None else ['GHI', 'DNI', 'DHI']
+        self.occupancy = {}
+        self.window = None
+        self.shared = None
+
+
+    def add_station(self, name, source):
+        """
+        Registers a station for comparison.
+
+        Args:
+            name (str): Station name used as the row label in the results.
+            source (str, DataAnalysis): Path to the station's data file or a DataAnalysis object.
+        """
+        self.stations[name] = source
+        self.occupancy.pop(name, None)
+        self.window = None
+        self.shared = None
+
+
+    def _load(self, source):
+        """
+        Returns the DataFrame for a station.
+
+        A DataAnalysis source whose data is already loaded is used as is. Otherwise only
+        the Timestamp and compared columns are read into a temporary frame, so the
+        caller's objects are left unloaded and the frame is released after use.
+
+        Raises:
+            ValueError: If the station data could not be loaded.
+        """
+        if isinstance(source, DataAnalysis):
+            if source.df is not None:
+                return source.df
+            source = source.file_path
+
+        data = DataAnalysis(source).load_data(columns=['Timestamp'] + self.columns)
+        if data is None:
+            raise ValueError(f"Could not load station data from '{source}'.")
+        return data
+
+
+    def _slot_values(self, data):
+        """
+        Returns the integer grid slot of every row and the compared columns as a float array.
+
+        Slots are nanoseconds since epoch divided by the grid step. Rows without a
+        valid Timestamp are dropped.
+
+        Raises:
+            ValueError: If the 'Timestamp' column or any compared column is missing.
+        """
+        missing_cols = [col for col in ['Timestamp'] + self.columns if col not in data.columns]
+        if missing_cols:
+            raise ValueError(f"Columns {missing_cols} not found in the station data.")
+
+        timestamps = pd.to_datetime(data['Timestamp'], errors='coerce')
+        valid = timestamps.notnull().to_numpy()
+        codes = timestamps[valid].to_numpy(dtype='datetime64[ns]').view('i8') // self.step.value
+        values = data[self.columns].to_numpy(dtype=float)[valid]
+        return codes, values
+
+
+    def _occupancy(self, data):
+        """
+        Returns the first slot of a station and a mask of the slots from there on that
+        hold at least one value in every compared column.
+
+        Raises:
+            ValueError: If the station has no complete observations.
+        """
+        codes, values = self._slot_values(data)
+        codes = codes[~np.isnan(values).any(axis=1)]
+        if not len(codes):
+            raise ValueError("Station data has no observations for the compared columns.")
+
+        start = codes.min()
+        covered = np.zeros(codes.max() - start + 1, dtype=bool)
+        covered[codes - start] = True
+        return start, covered
+
+
+    def align(self):
+        """
+        Finds the common time window and the grid slots inside it that every station covers.
+
+        Stations are processed one at a time; only their covered-slot masks are kept.
+
+        Returns:
+            tuple: The first and last grid slot (as pandas Timestamps) of the common window.
+
+        Raises:
+            ValueError: If no stations are registered or the stations do not overlap in time.
+        """
+        if not self.stations:
+            raise ValueError("No stations to compare. Please add stations first.")
+
+        for name, source in self.stations.items():
+            self.occupancy[name] = self._occupancy(self._load(source))
+
+        start = max(first for first, _ in self.occupancy.values())
+        end = min(first + len(covered) - 1 for first, covered in self.occupancy.values())
+        if start > end:
+            raise ValueError("Stations do not share an overlapping time window.")
+
+        shared = np.ones(end - start + 1, dtype=bool)
+        for first, covered in self.occupancy.values():
+            shared &= covered[start - first:end - first + 1]
+
+        self.window = (start, end)
+        self.shared = shared
+        return pd.Timestamp(start * self.step.value), pd.Timestamp(end * self.step.value)
+
+
+    def _station_metrics(self, data):
+        """
+        Reduces one station to its metrics over the shared grid with per-slot np.bincount sums.
+
+        Returns:
+            dict: Metric name to value, as described in compare().
+        """
+        start, end = self.window
+        n_slots = end - start + 1
+        slot_hours = self.step / pd.Timedelta(hours=1)
+
+        codes, values = self._slot_values(data)
+
+        # Z-scores over the whole station, matching DataAnalysis.data_quality_check
+        with np.errstate(invalid='ignore', divide='ignore'):
+            outliers = (values - np.nanmean(values, axis=0)) / np.nanstd(values, axis=0, ddof=1) > 3
+
+        in_window = (codes >= start) & (codes <= end)
+        codes, values, outliers = codes[in_window] - start, values[in_window], outliers[in_window]
+        rows = len(codes)
+        is_missing = np.isnan(values)
+
+        shared_slots = np.flatnonzero(self.shared)
+        covered = np.ones(n_slots, dtype=bool)
+        metrics = {'shared_coverage': len(shared_slots) / n_slots}
+
+        for i, col in enumerate(self.columns):
+            valid = ~is_missing[:, i]
+            counts = np.bincount(codes[valid], minlength=n_slots)
+            sums = np.bincount(codes[valid], weights=values[valid, i], minlength=n_slots)
+            covered &= counts > 0
+
+            if (counts[shared_slots] == 0).any():
+                raise ValueError("Station data changed since it was aligned. Please compare again.")
+            slot_means = sums[shared_slots] / counts[shared_slots]
+            metrics[f'{col}_kwh_m2'] = slot_means.sum() * slot_hours / 1000
+            if col == 'GHI':
+                mean = slot_means.mean() if len(slot_means) else np.nan
+                metrics['capacity_factor'] = mean / 1000
+                # Only differences between adjacent shared slots count towards variability
+                adjacent = np.diff(shared_slots) == 1
+                ramps = np.diff(slot_means)[adjacent]
+                metrics['ghi_variability'] = ramps.std() / mean if ramps.size else np.nan
+
+        metrics['coverage'] = covered.mean()
+        for i, col in enumerate(self.columns):
+            metrics[f'{col}_missing_rate'] = is_missing[:, i].sum() / rows if rows else np.nan
+            metrics[f'{col}_negative_rate'] = (values[:, i] < 0).sum() / rows if rows else np.nan
+            metrics[f'{col}_outlier_rate'] = outliers[:, i].sum() / rows if rows else np.nan
+        return metrics
+
+
+    def compare(self):
+        """
+        Computes side-by-side metrics for all stations on the shared grid.
+
+        Irradiation totals, capacity factor and variability use only the slots inside
+        the common window that every station covers, so gaps in one station do not
+        bias the comparison. Each station is loaded, reduced and released in turn.
+
+        Metrics per station:
+            shared_coverage: Fraction of window slots covered by every station (same for all rows).
+            <col>_kwh_m2: Irradiation total in kWh/m² over the shared slots (slot means times slot length).
+            capacity_factor: Mean GHI over the shared slots relative to 1000 W/m² (STC).
+            ghi_variability: Standard deviation of changes between adjacent shared slots over mean GHI.
+            coverage: Fraction of window slots this station covers.
+            <col>_missing_rate, <col>_negative_rate, <col>_outlier_rate: Quality-issue
+                rates as fractions of rows in the window.
+
+        Returns:
+            pandas.DataFrame: One row per station, one column per metric.
+        """
+        # Re-align every time, so stations whose data changed since the last call are not compared on a stale grid
+        self.align()
+
+        results = {name: self._station_metrics(self._load(source)) for name, source in self.stations.items()}
+        return pd.DataFrame.from_dict(results, orient='index')
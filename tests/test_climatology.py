@@ -0,0 +1,133 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+import pandas as pd
+
+# Add the project root to sys.path
+cwd = os.getcwd()
+project_root = os.path.dirname(cwd)
+sys.path.append(project_root)
+
+from scripts.climatology import ClimatologyCube
+from scripts.data_analysis_utils import DataAnalysis
+
+class TestClimatologyCube(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        rng = np.random.default_rng(0)
+        timestamps = pd.date_range('2022-01-01', periods=59 * 24 * 60, freq='min')
+        cls.data = pd.DataFrame({
+            'Timestamp': timestamps.astype(str),
+            'GHI': rng.uniform(0, 1000, len(timestamps)),
+            'Tamb': rng.uniform(10, 40, len(timestamps)),
+            'Comments': np.nan,
+        })
+        cls.data.loc[::5, 'GHI'] = np.nan
+        cls.cube = ClimatologyCube.from_frame(cls.data)
+        parsed = pd.to_datetime(cls.data['Timestamp'])
+        cls.groups = cls.data.groupby([parsed.dt.month, parsed.dt.hour])
+
+    def test_matches_groupby(self):
+        self.assertEqual(self.cube.columns, ['GHI', 'Tamb', 'Comments'])
+        for stat in ['mean', 'std', 'count', 'min', 'max']:
+            expected = self.groups['GHI'].agg(stat).unstack().to_numpy()
+            np.testing.assert_allclose(self.cube.table('GHI', stat).to_numpy()[:2], expected)
+
+    def test_percentile_within_histogram_bin(self):
+        expected = self.groups['Tamb'].quantile(0.9).unstack().to_numpy()
+        bin_width = np.diff(self.cube.edges[1, :2])[0]
+        actual = self.cube.table('Tamb', 'percentile', q=90).to_numpy()[:2]
+        self.assertLess(np.abs(actual - expected).max(), bin_width)
+
+    def test_merge_matches_single_pass(self):
+        half = len(self.data) // 2
+        merged = ClimatologyCube.from_frame(self.data.iloc[:half]).merge(
+            ClimatologyCube.from_frame(self.data.iloc[half:]))
+        np.testing.assert_array_equal(merged.hist, self.cube.hist)
+        np.testing.assert_allclose(merged.table('GHI', 'std'), self.cube.table('GHI', 'std'))
+
+    def test_merge_with_unranged_and_empty_columns(self):
+        rng = np.random.default_rng(1)
+        data = self.data.assign(Soil=rng.uniform(0, 50, len(self.data)))
+        half = len(data) // 2
+        first = data.iloc[:half].assign(Tamb=np.nan)
+        second = data.iloc[half:].assign(Soil=lambda frame: frame['Soil'] + 20)
+        merged = ClimatologyCube.from_frame(first).merge(ClimatologyCube.from_frame(second))
+        whole = pd.concat([first, second])
+
+        self.assertEqual(merged.columns, ['GHI', 'Tamb', 'Comments', 'Soil'])
+        parsed = pd.to_datetime(whole['Timestamp'])
+        groups = whole.groupby([parsed.dt.month, parsed.dt.hour])
+        for col in ['Tamb', 'Soil']:
+            np.testing.assert_array_equal(merged.table(col, 'count').to_numpy()[:2],
+                                          groups[col].count().unstack().to_numpy())
+            np.testing.assert_allclose(merged.table(col).to_numpy()[:2], groups[col].mean().unstack().to_numpy())
+        bin_width = np.diff(merged.edges[3, :2])[0]
+        expected = groups['Soil'].median().unstack().to_numpy()
+        actual = merged.table('Soil', 'percentile', q=50).to_numpy()[:2]
+        self.assertLess(np.abs(actual - expected).max(), 2 * bin_width)
+
+    def test_finer_bins_use_fewer_value_bins(self):
+        cube = ClimatologyCube.from_frame(self.data.iloc[:24 * 60], bin_minutes=1)
+        self.assertEqual(cube.hist.shape, (3, 12, 1440, 16))
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'cube.npz')
+            self.cube.save(path)
+            loaded = ClimatologyCube.load(path)
+        self.assertEqual(loaded.columns, self.cube.columns)
+        np.testing.assert_array_equal(loaded.count, self.cube.count)
+
+    def test_data_analysis_persists_cube(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'station.csv')
+            self.data.iloc[:24 * 60].to_csv(path, index=False)
+            data_analyzer = DataAnalysis(path)
+            data_analyzer.load_data()
+            cube = data_analyzer.climatology(bin_minutes=30)
+            data_analyzer.climatology(bin_minutes=60)
+            self.assertTrue(os.path.exists(os.path.join(directory, 'station.climatology.30min.npz')))
+            self.assertTrue(os.path.exists(os.path.join(directory, 'station.climatology.60min.npz')))
+            self.assertEqual(cube.slots, 48)
+            self.assertEqual(cube.profile('Tamb', months=[1]).count(), 48)
+
+            # A frame set directly must not be answered from, or written to, the file's cache
+            data_analyzer.df = self.data.iloc[:60].copy()
+            cube = data_analyzer.climatology(bin_minutes=60)
+            self.assertEqual(cube.table('Tamb', 'count').to_numpy().sum(), 60)
+            self.assertEqual(ClimatologyCube.load(os.path.join(
+                directory, 'station.climatology.60min.npz')).table('Tamb', 'count').to_numpy().sum(), 24 * 60)
+
+    def test_unwritable_cache_falls_back_to_memory(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'station.csv')
+            self.data.iloc[:24 * 60].to_csv(path, index=False)
+            data_analyzer = DataAnalysis(path)
+            data_analyzer.load_data()
+            with mock.patch.object(ClimatologyCube, 'save', side_effect=PermissionError('read-only')):
+                cube = data_analyzer.climatology()
+            self.assertFalse(os.path.exists(os.path.join(directory, 'station.climatology.60min.npz')))
+        self.assertEqual(cube.table('Tamb', 'count').to_numpy().sum(), 24 * 60)
+
+    def test_missing_timestamps_skipped(self):
+        data = self.data.iloc[:100].copy()
+        data.loc[[3, 4], 'Timestamp'] = [None, 'not a time']
+        cube = ClimatologyCube.from_frame(data)
+        self.assertEqual(cube.table('Tamb', 'count').to_numpy().sum(), 98)
+
+    def test_invalid_months_raise(self):
+        for months in ([0], [13]):
+            with self.assertRaises(ValueError):
+                self.cube.profile('GHI', months=months)
+
+    def test_invalid_bin_minutes_raises(self):
+        with self.assertRaises(ValueError):
+            ClimatologyCube.from_frame(self.data, bin_minutes=7)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import os
+import sys
+import unittest
+import numpy as np
+import pandas as pd
+
+# Add the project root to sys.path
+cwd = os.getcwd()
+project_root = os.path.dirname(cwd)
+sys.path.append(project_root)
+
+from scripts.data_analysis_utils import DataAnalysis
+from scripts.pv_simulation import PVSimulation, solar_position
+
+class TestPVSimulation(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        timestamps = pd.Series(pd.date_range('2022-03-21', periods=24 * 60, freq='min'))
+        zenith, _ = solar_position(timestamps, 11.1, 3.4, utc_offset=1)
+        cos_zenith = np.clip(np.cos(zenith), 0, None)
+        cls.data_analyzer = DataAnalysis(None)
+        cls.data_analyzer.df = pd.DataFrame({
+            'Timestamp': timestamps.astype(str),
+            'GHI': 900 * cos_zenith,
+            'DNI': 800 * (cos_zenith > 0),
+            'DHI': 100 * cos_zenith,
+            'Tamb': 30.0,
+            'WS': 2.0,
+            'TModA': 45.0,
+        })
+        cls.simulation = PVSimulation(cls.data_analyzer, 11.1, 3.4, utc_offset=1)
+
+    def test_solar_noon_near_zenith(self):
+        timestamps = pd.Series(pd.to_datetime(['2022-03-21 12:50', '2022-03-21 00:00']))
+        zenith, azimuth = solar_position(timestamps, 11.1, 3.4, utc_offset=1)
+        self.assertLess(np.degrees(zenith[0]), 15)
+        self.assertGreater(np.degrees(zenith[1]), 90)
+
+    def test_horizontal_plane_receives_ghi(self):
+        # The fixture satisfies GHI = DNI * cos(zenith) + DHI, so a flat panel sees exactly GHI
+        results = self.simulation.simulate([0], [180], [1])
+        expected = self.data_analyzer.df['GHI'].sum() / 60 / 1000
+        self.assertAlmostEqual(results['poa_kwh_m2'][0], expected, places=6)
+
+    def test_simulate_configuration_grid(self):
+        results = self.simulation.simulate([0, 10, 20], [90, 180], [1, 100])
+        self.assertEqual(len(results), 12)
+        self.assertTrue((results['ac_kwh'] <= results['dc_kwh']).all())
+        small = results[results['system_size_kw'] == 1]['ac_kwh'].to_numpy()
+        large = results[results['system_size_kw'] == 100]['ac_kwh'].to_numpy()
+        np.testing.assert_allclose(large, small * 100)
+
+    def test_chunking_matches_single_pass(self):
+        single = self.simulation.simulate(np.arange(0, 40, 5), [135, 180, 225], [10])
+        chunked = self.simulation.simulate(np.arange(0, 40, 5), [135, 180, 225], [10], chunk_size=5)
+        np.testing.assert_allclose(single['ac_kwh'], chunked['ac_kwh'])
+
+    def test_process_pool_matches_single_pass(self):
+        single = self.simulation.simulate(np.arange(0, 40, 5), [135, 180, 225], [10])
+        pooled = self.simulation.simulate(np.arange(0, 40, 5), [135, 180, 225], [10], chunk_size=5, n_jobs=2)
+        np.testing.assert_allclose(single['ac_kwh'], pooled['ac_kwh'])
+
+    def test_no_complete_rows_raises(self):
+        data = self.data_analyzer.df.assign(Tamb=np.nan)
+        with self.assertRaises(ValueError):
+            self.simulation.simulate([10], [180], [1], data=data)
+
+    def test_measured_module_temperature(self):
+        modelled = self.simulation.simulate([10], [180], [1])
+        measured = self.simulation.simulate([10], [180], [1], use_module_temp=True)
+        self.assertNotAlmostEqual(modelled['dc_kwh'][0], measured['dc_kwh'][0])
+
+    def test_unknown_parameter_raises(self):
+        with self.assertRaises(ValueError):
+            PVSimulation(self.data_analyzer, 11.1, 3.4, bogus=1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import os
+import sys
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+
+# Add the project root to sys.path
+cwd = os.getcwd()
+project_root = os.path.dirname(cwd)
+sys.path.append(project_root)
+
+from scripts.data_analysis_utils import DataAnalysis
+from scripts.station_comparison import StationComparison
+
+def make_station(start, periods, ghi):
+    analyzer = DataAnalysis(None)
+    analyzer.df = pd.DataFrame({
+        'Timestamp': pd.date_range(start, periods=periods, freq='min').astype(str),
+        'GHI': ghi,
+        'DNI': np.zeros(periods),
+        'DHI': np.zeros(periods),
+    })
+    return analyzer
+
+class TestStationComparison(unittest.TestCase):
+
+    def setUp(self):
+        self.comparison = StationComparison({
+            'A': make_station('2022-01-01 00:00', 180, np.full(180, 600.0)),
+            'B': make_station('2022-01-01 01:00', 180, np.full(180, 300.0)),
+        }, freq='h')
+
+    def test_align_uses_shared_window(self):
+        start, end = self.comparison.align()
+        self.assertEqual(start, pd.Timestamp('2022-01-01 01:00'))
+        self.assertEqual(end, pd.Timestamp('2022-01-01 02:00'))
+
+    def test_compare_metrics(self):
+        results = self.comparison.compare()
+        self.assertEqual(list(results.index), ['A', 'B'])
+        self.assertAlmostEqual(results.loc['A', 'GHI_kwh_m2'], 1.2)
+        self.assertAlmostEqual(results.loc['B', 'capacity_factor'], 0.3)
+        self.assertAlmostEqual(results.loc['B', 'coverage'], 1.0)
+        self.assertAlmostEqual(results.loc['A', 'GHI_missing_rate'], 0.0)
+
+    def test_gap_excluded_from_shared_grid(self):
+        gapped = make_station('2022-01-01 00:00', 240, np.full(240, 300.0))
+        gapped.df = gapped.df.drop(index=range(60, 120))
+        comparison = StationComparison({
+            'A': make_station('2022-01-01 00:00', 240, np.full(240, 600.0)),
+            'B': gapped,
+        }, freq='h')
+        results = comparison.compare()
+        self.assertAlmostEqual(results.loc['A', 'GHI_kwh_m2'], 1.8)
+        self.assertAlmostEqual(results.loc['B', 'GHI_kwh_m2'], 0.9)
+        self.assertAlmostEqual(results.loc['A', 'coverage'], 1.0)
+        self.assertAlmostEqual(results.loc['B', 'coverage'], 0.75)
+        self.assertAlmostEqual(results.loc['B', 'shared_coverage'], 0.75)
+
+    def test_file_backed_stations_stay_unloaded(self):
+        with tempfile.TemporaryDirectory() as directory:
+            stations = {}
+            for name, ghi in [('A', 600.0), ('B', 300.0)]:
+                path = os.path.join(directory, f'{name}.csv')
+                data = make_station('2022-01-01 00:00', 120, np.full(120, ghi)).df
+                data['Comments'] = 'note'
+                data.to_csv(path, index=False)
+                stations[name] = DataAnalysis(path)
+            results = StationComparison(stations, freq='h').compare()
+        self.assertAlmostEqual(results.loc['A', 'GHI_kwh_m2'], 1.2)
+        self.assertAlmostEqual(results.loc['B', 'GHI_kwh_m2'], 0.6)
+        self.assertTrue(all(station.df is None for station in stations.values()))
+
+    def test_compare_realigns_after_data_changes(self):
+        self.comparison.compare()
+        station = self.comparison.stations['A']
+        station.df = station.df.iloc[:90]
+        results = self.comparison.compare()
+        self.assertEqual(self.comparison.window[1] - self.comparison.window[0], 0)
+        self.assertAlmostEqual(results.loc['A', 'GHI_kwh_m2'], 0.6)
+        self.assertFalse(results[['GHI_kwh_m2', 'capacity_factor']].isnull().any().any())
+
+    def test_no_overlap_raises(self):
+        self.comparison.add_station('C', make_station('2023-01-01 00:00', 60, np.zeros(60)))
+        with self.assertRaises(ValueError):
+            self.comparison.align()
+
+if __name__ == '__main__':
+    unittest.main()